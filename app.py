@@ -1,367 +1,452 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
+from flask_compress import Compress
 import pandas as pd
+import gzip
 import os
+import tempfile
 import numpy as np
-from itertools import combinations
+import brotli
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from contextlib import suppress
+from functools import lru_cache, wraps
 from pathlib import Path
 app = Flask(__name__)
 # Enhance CORS configuration (to avoid cross-domain issues)
 CORS(app)
+# Compress JSON responses (network payloads repeat the same ids/strings heavily); tiny responses are sent as is
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 1024
+Compress(app)
 CURRENT_DIR = Path(__file__).resolve().parent  
+REFS_CSV_PATH = CURRENT_DIR/"refs_yeshiva_cs_20_25.csv"
+AFFILS_CSV_PATH = CURRENT_DIR/"affils_yeshiva_cs_20_25.csv"
 # --------------------------
-# Core utility function: Converts NumPy types to native Python types (solves JSON serialization issues).
+# JSON serialization: orjson encodes NumPy scalars/arrays natively in C, no conversion pass needed
 # --------------------------
-def convert_numpy_types(obj):
-    """Recursively converts NumPy types to native Python types (solves JSON serialization issues)."""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    else:
-        return obj
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def to_json_bytes(data):
+    """Serializes data (including NumPy values) to JSON bytes."""
+    return orjson.dumps(data, option=ORJSON_OPTIONS)
 
 
 # --------------------------
-# Utility function: Clean the author_position field (resolves non-numeric value issues)
+# Caching: parsed CSVs and generated networks are memoized per file mtime
 # --------------------------
-def clean_author_position(position):
+def get_mtime(path):
+    """Returns the modification time of a file, or None if it does not exist."""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def cached_by_mtime(csv_path, maxsize=1):
     """
-    Clean the author_position field to ensure it contains only numeric values.
-    - Numeric strings (e.g., '1') are converted to integers.
-    - Non-numeric strings (e.g., 'middle'/'last') are mapped to reasonable values.
-    - Unrecognized values are returned as None (for later filtering).
+    Memoizes a function until the CSV file it reads is modified.
+    The file's mtime is part of the cache key, so editing the CSV invalidates the cache automatically.
     """
-    if pd.isna(position):
-        return None
-    
-    try:
-        return int(position)
-    except (ValueError, TypeError):
-        # Handling non-numeric strings (common scenarios: 'middle' = intermediate author, 'last' = corresponding author)
-        position_str = str(position).strip().lower()
-        if position_str in ["middle", "mid"]:
-            return 2  # Intermediate authors are mapped to 2
-        elif position_str in ["last", "corresponding", "corr"]:
-            return -1  # Corresponding authors are mapped to -1 (for later identification)
-        else:
-            # Unrecognized values (e.g., 'unknown') are returned as None (for later filtering)
-            return None
-
-
-
-def generate_citation_network():
-    csv_path = CURRENT_DIR/"refs_yeshiva_cs_20_25.csv"  
+    def decorator(func):
+        cached = lru_cache(maxsize=maxsize)(lambda mtime, *args: func(*args))
+
+        @wraps(func)
+        def wrapper(*args):
+            return cached(get_mtime(csv_path), *args)
+        return wrapper
+    return decorator
+
+
+# (message when the CSV is missing, message prefix when building the network fails)
+CITATION_NETWORK_ERRORS = (
+    "The CSV file for the citation network could not be found. Please check the path: ",
+    "Data processing failed: "
+)
+COLLABORATION_NETWORK_ERRORS = (
+    "The CSV file for the author collaboration network could not be found.：",
+    "Author collaboration network data processing failed："
+)
+
+
+def network_or_error(csv_path, build, errors):
+    """
+    Calls a cached network builder, turning a missing CSV or a failure into an error payload.
+    Errors are raised inside the cache and built here, so they are never memoized and the next request retries.
+    """
+    not_found_message, failed_message = errors
     if not os.path.exists(csv_path):
-        return convert_numpy_types({
-            "error": f"The CSV file for the citation network could not be found. Please check the path: {csv_path}",
+        return {
+            "error": f"{not_found_message}{csv_path}",
             "nodes": [],
             "links": []
-        })
+        }
     
     try:
-       # Specify dtype as a native Python type when reading CSV (to avoid NumPy types)
-        df = pd.read_csv(csv_path, dtype={
-            "citing_paperid": str,
-            "cited_paperid": str,
-            "year": int,  # Force to Python int
-            "ref_year": int  # Force to Python int
-        })
-        
-        # Data Cleaning
-        df_clean = df.dropna(subset=["citing_paperid", "cited_paperid", "year", "ref_year"])
-        df_clean = df_clean[(df_clean["year"] >= 2020) & (df_clean["year"] <= 2025)]
-        
-        # Generate nodes 
-        all_paper_ids = pd.concat([df_clean["citing_paperid"], df_clean["cited_paperid"]]).unique()
-        nodes = []
-        
-        for paper_id in all_paper_ids:
-            citing_records = df_clean[df_clean["citing_paperid"] == paper_id]
-            cited_records = df_clean[df_clean["cited_paperid"] == paper_id]
-            
-            # Determine publication year (convert to native Python int)
-            if not citing_records.empty:
-                publish_year = int(citing_records["year"].iloc[0])
-            elif not cited_records.empty:
-                publish_year = int(cited_records["ref_year"].iloc[0])
-            else:
-                publish_year = "Unknown"
-            
-            # Count citations (convert to native Python int)
-            citation_count = int(len(cited_records))
-            
-            nodes.append({
-                "id": paper_id,
-                "name": f"Paper_{paper_id}",
-                "publish_year": publish_year,
-                "citation_count": citation_count,
-                "institution": "Yeshiva University, Computer Science Department"
-            })
-        
-        # Generate edges (count citations)
-        link_groups = df_clean.groupby(["cited_paperid", "citing_paperid"]).size().reset_index(name="citation_times")
-        links = []
-        
-        for _, row in link_groups.iterrows():
-            cited_id = row["cited_paperid"]
-            citing_id = row["citing_paperid"]
-            cite_times = int(row["citation_times"])  # Convert to native Python int
-            
-            if any(node["id"] == cited_id for node in nodes) and any(node["id"] == citing_id for node in nodes):
-                citing_year = int(df_clean[df_clean["citing_paperid"] == citing_id]["year"].iloc[0])
-                cited_year = int(df_clean[df_clean["cited_paperid"] == cited_id]["ref_year"].iloc[0])
-                
-                links.append({
-                    "source": cited_id,
-                    "target": citing_id,
-                    "value": cite_times,
-                    "citing_year": citing_year,
-                    "cited_year": cited_year,
-                    "year_diff": citing_year - cited_year  # Add year difference
-                })
-        
-        # Key: Convert all numpy types to native Python types
-        result = convert_numpy_types({
-            "nodes": nodes,
-            "links": links
-        })
-        return result
-    
+        return build()
     except Exception as e:
-        return convert_numpy_types({
-            "error": f"Data processing failed: {str(e)}",
+        return {
+            "error": f"{failed_message}{str(e)}",
             "nodes": [],
             "links": []
-        })
+        }
 
 
-def generate_collaboration_network():
-    affils_csv_path = CURRENT_DIR/"affils_yeshiva_cs_20_25.csv"
-    if not os.path.exists(affils_csv_path):
-        return convert_numpy_types({
-            "error": f"The CSV file for the author collaboration network could not be found.：{affils_csv_path}",
-            "nodes": [],
-            "links": []
-        })
-    
+# Bump when the way CSVs are parsed changes, so sidecars written by an older reader are re-parsed
+PARQUET_SIDECAR_VERSION = "2"
+
+
+def parquet_sidecar_tag(column_types):
+    """Identifies how a sidecar was produced: reader version plus the requested column types."""
+    types = ";".join(f"{name}={column_type}" for name, column_type in sorted(column_types.items()))
+    return f"v{PARQUET_SIDECAR_VERSION};{types}".encode("utf-8")
+
+
+def read_parquet_sidecar(parquet_path, column_types):
+    """
+    Returns the sidecar as a DataFrame, or None if it is unreadable or was written by another reader version
+    or with other column types.
+    """
     try:
- 
-        affils_df = pd.read_csv(affils_csv_path, dtype={
-            "paperid": str,
-            "authorid": str,
-            "institutionid": str
-        })
-        
+        table = pq.read_table(parquet_path)
+    except (OSError, pa.ArrowException):
+        return None
+    metadata = table.schema.metadata or {}
+    if metadata.get(b"csv_reader") != parquet_sidecar_tag(column_types):
+        return None
+    if any(table.schema.field(name).type != column_type for name, column_type in column_types.items()):
+        return None
+    return table.to_pandas()
+
+
+def read_csv_with_parquet_cache(csv_path, column_types):
+    """
+    Reads a CSV through a sidecar .parquet file written next to it on first read.
+    The Parquet copy is used as long as it is not older than the CSV and was written by the current reader;
+    a broken or outdated sidecar is ignored and rewritten. If it cannot be written
+    (e.g. read-only data directory), the CSV is simply parsed every time.
+    """
+    csv_path = Path(csv_path)
+    parquet_path = csv_path.with_suffix(".parquet")
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        df = read_parquet_sidecar(parquet_path, column_types)
+        if df is not None:
+            return df
+
+    # pyarrow's CSV reader parses the file multi-threaded and is much faster than the pandas C engine.
+    # Column types are fixed up front: pd.read_csv(engine="pyarrow", dtype=str) infers numbers first and
+    # only casts afterwards, which turns ids like "007" into "7".
+    table = pacsv.read_csv(csv_path, convert_options=pacsv.ConvertOptions(
+        column_types=column_types,
+        strings_can_be_null=True  # Empty fields become NaN, as with pd.read_csv
+    ))
+    tmp_path = None
+    try:
+        # Write to a per-process temporary file first, so concurrent workers never see or clobber a partial file
+        with tempfile.NamedTemporaryFile(dir=parquet_path.parent, prefix=f"{parquet_path.name}.",
+                                         suffix=".tmp", delete=False) as tmp:
+            tmp_path = tmp.name
+        tagged = table.replace_schema_metadata({b"csv_reader": parquet_sidecar_tag(column_types)})
+        pq.write_table(tagged, tmp_path, compression="zstd")
+        os.replace(tmp_path, parquet_path)
+    except (OSError, pa.ArrowException):
+        # A failed cache write must never break the read: drop the partial file and serve the parsed CSV
+        if tmp_path is not None:
+            with suppress(OSError):
+                os.unlink(tmp_path)
+    return table.to_pandas()
+
+
+@lru_cache(maxsize=2)
+def _load_refs_df(csv_path, mtime):
+    """Parses the citation CSV once per file version. The returned DataFrame is shared, do not modify it in place."""
+    # Ids stay strings exactly as written in the file; years are read as integers
+    return read_csv_with_parquet_cache(csv_path, column_types={
+        "citing_paperid": pa.string(),
+        "cited_paperid": pa.string(),
+        "year": pa.int64(),
+        "ref_year": pa.int64()
+    })
+
+
+@lru_cache(maxsize=2)
+def _load_affils_df(csv_path, mtime):
+    """Parses the affiliation CSV once per file version. The returned DataFrame is shared, do not modify it in place."""
+    return read_csv_with_parquet_cache(csv_path, column_types={
+        "paperid": pa.string(),
+        "authorid": pa.string(),
+        "institutionid": pa.string()
+    })
+
+
+# --------------------------
+# Utility function: Clean the author_position field (resolves non-numeric value issues)
+# --------------------------
+# Non-numeric author_position values and their numeric codes
+# (common scenarios: 'middle' = intermediate author, 'last' = corresponding author)
+AUTHOR_POSITION_ALIASES = {
+    "middle": 2,  # Intermediate authors are mapped to 2
+    "mid": 2,
+    "last": -1,  # Corresponding authors are mapped to -1 (for later identification)
+    "corresponding": -1,
+    "corr": -1
+}
+
+
+def clean_author_positions(positions):
+    """
+    Clean the author_position column to ensure it contains only numeric values (vectorized).
+    - Numeric columns keep their values, truncated to integers like int(); infinities are dropped.
+    - Integer strings (e.g., '1') are converted to numbers; other numeric text (e.g., '1.5', 'inf') is not.
+    - Non-numeric strings (e.g., 'middle'/'last') are mapped through AUTHOR_POSITION_ALIASES.
+    - Unrecognized values (e.g., 'unknown') become NaN (for later filtering).
+    """
+    if pd.api.types.is_numeric_dtype(positions):
+        return np.trunc(positions.where(np.isfinite(positions)))
     
-        sample_size = 1000
-        if len(affils_df) > sample_size:
-            unique_papers = affils_df["paperid"].unique()[:sample_size]
-            affils_df = affils_df[affils_df["paperid"].isin(unique_papers)]
-        
+    numeric = pd.to_numeric(positions, errors="coerce")
+    # Like int(position), only integer literals count as numeric text
+    numeric = numeric.where(positions.astype(str).str.fullmatch(r"\s*[+-]?\d+\s*"))
+    residual = positions[numeric.isna() & positions.notna()]
+    aliases = residual.astype(str).str.strip().str.lower().map(AUTHOR_POSITION_ALIASES)
+    return numeric.fillna(aliases)
+
+
+
+@cached_by_mtime(REFS_CSV_PATH)
+def _citation_network_tables():
+    """
+    Cleans the citation CSV and runs the groupbys shared by both citation networks, once per CSV version.
+    Returns (paper ids, publish years, citation counts, links); the arrays are aligned with the paper ids.
+    """
+    df = _load_refs_df(REFS_CSV_PATH, get_mtime(REFS_CSV_PATH))
+    
+    # Data Cleaning
+    df_clean = df.dropna(subset=["citing_paperid", "cited_paperid", "year", "ref_year"])
+    df_clean = df_clean[(df_clean["year"] >= 2020) & (df_clean["year"] <= 2025)]
+    # Categorical ids: groupby/merge hash small integer codes instead of Python strings
+    df_clean = df_clean.astype({"citing_paperid": "category", "cited_paperid": "category"})
+    
+    # Node attributes (one groupby pass per attribute instead of re-scanning df_clean for every paper)
+    # Union of the (already unique) categories, not of the full id columns
+    all_paper_ids = df_clean["citing_paperid"].cat.categories.union(df_clean["cited_paperid"].cat.categories)
+    # Re-encode both id columns over the same categories, so a code identifies the same paper in either column
+    # and indexes straight into arrays aligned with all_paper_ids
+    paper_id_dtype = pd.CategoricalDtype(all_paper_ids)
+    df_clean = df_clean.astype({"citing_paperid": paper_id_dtype, "cited_paperid": paper_id_dtype})
+    citing_years = df_clean.groupby("citing_paperid", observed=True)["year"].first().reindex(all_paper_ids).to_numpy()
+    cited_years = df_clean.groupby("cited_paperid", observed=True)["ref_year"].first().reindex(all_paper_ids).to_numpy()
+    cite_counts = df_clean.groupby("cited_paperid", observed=True).size().reindex(all_paper_ids, fill_value=0).to_numpy()
+    # Determine publication year: the year the paper cites others, otherwise the year it was cited as
+    publish_years = np.where(np.isnan(citing_years), cited_years, citing_years).astype(int)
+    
+    # Generate edges (count citations)
+    link_groups = df_clean.groupby(["cited_paperid", "citing_paperid"], observed=True).size().reset_index(name="citation_times")
+    cited_codes = link_groups["cited_paperid"].cat.codes.to_numpy()
+    citing_codes = link_groups["citing_paperid"].cat.codes.to_numpy()
+    # No membership filter needed: every paper id becomes a node, so both endpoints of every link are nodes
+    
+    citing_year = citing_years[citing_codes].astype(int)
+    cited_year = cited_years[cited_codes].astype(int)
+    links = pd.DataFrame({
+        "source": link_groups["cited_paperid"].to_numpy(),
+        "target": link_groups["citing_paperid"].to_numpy(),
+        "value": link_groups["citation_times"].to_numpy(),
+        "citing_year": citing_year,
+        "cited_year": cited_year,
+        "year_diff": citing_year - cited_year  # Add year difference
+    }).to_dict(orient="records")
     
-        df_clean = affils_df.copy()
-        df_clean["author_position_clean"] = df_clean["author_position"].apply(clean_author_position)
-        df_clean = df_clean.dropna(subset=["paperid", "authorid", "author_position_clean"])
-        df_clean = df_clean[
-            (df_clean["paperid"].str.strip() != "") & 
-            (df_clean["authorid"].str.strip() != "")
+    return all_paper_ids, publish_years, cite_counts, links
+
+
+def _build_citation_network(enhanced):
+    """Builds the citation network from the shared tables; enhanced adds topic and impact_score to every node."""
+    all_paper_ids, publish_years, cite_counts, links = _citation_network_tables()
+    
+    nodes = [{
+        "id": paper_id,
+        "name": f"Paper_{paper_id}",
+        "publish_year": publish_year,
+        "citation_count": citation_count,
+        "institution": "Yeshiva University, Computer Science Department"
+    } for paper_id, publish_year, citation_count in zip(all_paper_ids, publish_years.tolist(), cite_counts.tolist())]
+    
+    if enhanced:
+        # One vectorized expression over all papers, aligned positionally with the nodes
+        impact_scores = cite_counts.astype(np.float64) * 0.8 + 2.0
+        nodes = [
+            {**node, "topic": "Computer Science", "impact_score": impact_score}
+            for node, impact_score in zip(nodes, impact_scores.tolist())
         ]
-        
-      
-        author_papers = df_clean.groupby("authorid")["paperid"].nunique().reset_index(name="papers_published")
-        first_author_papers = df_clean[df_clean["author_position_clean"] == 1].groupby("authorid")["paperid"].nunique().reset_index(name="first_author_papers")
-        corr_author_papers = df_clean[df_clean["author_position_clean"] == -1].groupby("authorid")["paperid"].nunique().reset_index(name="corr_author_papers")
-        
-        author_attrs = pd.merge(author_papers, first_author_papers, on="authorid", how="left").fillna({"first_author_papers": 0})
-        author_attrs = pd.merge(author_attrs, corr_author_papers, on="authorid", how="left").fillna({"corr_author_papers": 0})
-        author_attrs = author_attrs[author_attrs["papers_published"] >= 0]  
-        
- 
-        nodes = []
-        for _, row in author_attrs.iterrows():
-            author_id = row["authorid"]
-            nodes.append({
-                "id": author_id,
-                "name": f"Author_{author_id}",
-                "department": "Yeshiva University, Computer Science Department",
-                "papers_published": int(row["papers_published"]),
-                "first_author_papers": int(row["first_author_papers"]),
-                "corr_author_papers": int(row["corr_author_papers"]),
-                "h_index": int(min(row["papers_published"], 15))
-            })
-        
-      
-        paper_authors = df_clean.groupby("paperid")["authorid"].apply(list).reset_index(name="authors")
-        collaboration_pairs = []
-        
-        for _, row in paper_authors.iterrows():
-            authors = sorted(row["authors"])
-            if len(authors) >= 2:
-                pairs = combinations(authors, 2)
-                for pair in pairs:
-                    collaboration_pairs.append({
-                        "source_author": pair[0],
-                        "target_author": pair[1],
-                        "paperid": row["paperid"]
-                    })
-        
-        collaboration_counts = pd.DataFrame(collaboration_pairs).groupby(
-            ["source_author", "target_author"]
-        ).size().reset_index(name="collaboration_times")
-        
-        node_ids = set(node["id"] for node in nodes)
-        links = []
-        for _, row in collaboration_counts.iterrows():
-            source = row["source_author"]
-            target = row["target_author"]
-            collab_times = int(row["collaboration_times"])
-            
-            if source in node_ids and target in node_ids:
-                links.append({
-                    "source": source,
-                    "target": target,
-                    "value": collab_times,
-                    "co_authored_papers": collab_times
-                })
-        
-        return convert_numpy_types({"nodes": nodes, "links": links})
     
-    except Exception as e:
-        return convert_numpy_types({
-            "error": f"Author collaboration network data processing failed：{str(e)}",
-            "nodes": [],
-            "links": []
-        })
-def generate_enhanced_citation_network():
-    csv_path = CURRENT_DIR/"refs_yeshiva_cs_20_25.csv"  
-    if not os.path.exists(csv_path):
-        return convert_numpy_types({
-            "error": f"The CSV file for the citation network could not be found. Please check the path: {csv_path}",
-            "nodes": [],
-            "links": []
-        })
+    return {
+        "nodes": nodes,
+        "links": links
+    }
+
+
+# The network dicts are not cached themselves: they are only read once per CSV version, by the cached
+# *_json payloads below, so only the serialized bytes stay resident
+def _citation_network():
+    return _build_citation_network(enhanced=False)
+
+
+def _enhanced_citation_network():
+    return _build_citation_network(enhanced=True)
+
+
+def _collaboration_network():
+    affils_df = _load_affils_df(AFFILS_CSV_PATH, get_mtime(AFFILS_CSV_PATH))
     
-    try:
-       
-        df = pd.read_csv(csv_path, dtype={
-            "citing_paperid": str,
-            "cited_paperid": str,
-            "year": int,  
-            "ref_year": int  
-        })
-        
-       
-        df_clean = df.dropna(subset=["citing_paperid", "cited_paperid", "year", "ref_year"])
-        df_clean = df_clean[(df_clean["year"] >= 2020) & (df_clean["year"] <= 2025)]
-        
-      
-        all_paper_ids = pd.concat([df_clean["citing_paperid"], df_clean["cited_paperid"]]).unique()
-        nodes = []
-        
-        for paper_id in all_paper_ids:
-            citing_records = df_clean[df_clean["citing_paperid"] == paper_id]
-            cited_records = df_clean[df_clean["cited_paperid"] == paper_id]
-            
-           
-            if not citing_records.empty:
-                publish_year = int(citing_records["year"].iloc[0])
-            elif not cited_records.empty:
-                publish_year = int(cited_records["ref_year"].iloc[0])
-            else:
-                publish_year = "Unknown"
-            
-            
-            citation_count = int(len(cited_records))
-            impact_score = citation_count * 0.8 + 2.0
-            nodes.append({
-                "id": paper_id,
-                "name": f"Paper_{paper_id}",
-                "publish_year": publish_year,
-                "citation_count": citation_count,
-                "institution": "Yeshiva University, Computer Science Department",
-                "topic": "Computer Science",
-                "impact_score": float(impact_score)
-            })
-        
-     
-        link_groups = df_clean.groupby(["cited_paperid", "citing_paperid"]).size().reset_index(name="citation_times")
-        links = []
-        
-        for _, row in link_groups.iterrows():
-            cited_id = row["cited_paperid"]
-            citing_id = row["citing_paperid"]
-            cite_times = int(row["citation_times"])  
-            
-            if any(node["id"] == cited_id for node in nodes) and any(node["id"] == citing_id for node in nodes):
-                citing_year = int(df_clean[df_clean["citing_paperid"] == citing_id]["year"].iloc[0])
-                cited_year = int(df_clean[df_clean["cited_paperid"] == cited_id]["ref_year"].iloc[0])
-                
-                links.append({
-                    "source": cited_id,
-                    "target": citing_id,
-                    "value": cite_times,
-                    "citing_year": citing_year,
-                    "cited_year": cited_year,
-                    "year_diff": citing_year - cited_year  
-                })
-        
-       
-        result = convert_numpy_types({
-            "nodes": nodes,
-            "links": links
-        })
-        return result
+
+    sample_size = 1000
+    if len(affils_df) > sample_size:
+        # Keep the first sample_size papers in file order (ngroup numbers papers by first appearance)
+        paper_order = affils_df.groupby("paperid", sort=False, dropna=False).ngroup()
+        affils_df = affils_df[paper_order < sample_size]
     
-    except Exception as e:
-        return convert_numpy_types({
-            "error": f"Data processing failed: {str(e)}",
-            "nodes": [],
-            "links": []
+
+    # Only the columns used below, without copying them (affils_df may be the shared cached frame)
+    df_clean = pd.DataFrame({
+        "paperid": affils_df["paperid"],
+        "authorid": affils_df["authorid"],
+        "author_position_clean": clean_author_positions(affils_df["author_position"])
+    }, copy=False)
+    df_clean = df_clean.dropna(subset=["paperid", "authorid", "author_position_clean"])
+    df_clean = df_clean[
+        (df_clean["paperid"].str.strip() != "") & 
+        (df_clean["authorid"].str.strip() != "")
+    ]
+    df_clean = df_clean.astype({"paperid": "category", "authorid": "category"})
+    
+  
+    # One row per (author, paper) with first/corresponding flags, then a single aggregation per author
+    author_paper_roles = df_clean.assign(
+        is_first=df_clean["author_position_clean"].eq(1),
+        is_corr=df_clean["author_position_clean"].eq(-1)
+    ).groupby(["authorid", "paperid"], observed=True)[["is_first", "is_corr"]].any()
+    author_attrs = author_paper_roles.groupby("authorid", observed=True).agg(
+        papers_published=("is_first", "size"),
+        first_author_papers=("is_first", "sum"),
+        corr_author_papers=("is_corr", "sum")
+    ).reset_index()
+    
+ 
+    nodes = []
+    for author_id, papers_published, first_author, corr_author in author_attrs.itertuples(index=False, name=None):
+        nodes.append({
+            "id": author_id,
+            "name": f"Author_{author_id}",
+            "department": "Yeshiva University, Computer Science Department",
+            "papers_published": int(papers_published),
+            "first_author_papers": int(first_author),
+            "corr_author_papers": int(corr_author),
+            "h_index": int(min(papers_published, 15))
         })
+    
+  
+    # Pair up co-authors with a self-merge on paperid (each unordered pair kept once via source < target)
+    paper_authors = df_clean[["paperid", "authorid"]]
+    pairs = paper_authors.merge(paper_authors, on="paperid", suffixes=("_source", "_target"))
+    # Categories are sorted, so comparing codes orders pairs the same way as comparing the id strings
+    pairs = pairs[pairs["authorid_source"].cat.codes < pairs["authorid_target"].cat.codes]
+    collaboration_counts = pairs.groupby(
+        ["authorid_source", "authorid_target"], observed=True
+    ).size().reset_index(name="collaboration_times")
+    
+    # Nodes and pairs both come from df_clean, so every pair's authors are nodes: no membership filter needed
+    links = collaboration_counts.rename(columns={
+        "authorid_source": "source",
+        "authorid_target": "target",
+        "collaboration_times": "value"
+    }).assign(co_authored_papers=lambda links: links["value"]).to_dict(orient="records")
+    
+    return {"nodes": nodes, "links": links}
+
+
+# --------------------------
+# Cached JSON payloads (serialized and compressed once per CSV version, repeat GETs reuse the bytes)
+# --------------------------
+# Content encodings the network payloads are pre-compressed in, in order of preference
+NETWORK_ENCODINGS = ("br", "gzip")
+
+
+def compress_payload(body, encoding):
+    """Compresses a payload; it is done once per CSV version, so a higher level than flask-compress's default is affordable."""
+    if encoding == "br":
+        return brotli.compress(body, quality=9)
+    return gzip.compress(body, compresslevel=9)
+
+
+def cached_network_json(csv_path, build):
+    """
+    Caches a network's JSON bytes per CSV version, plus one compressed copy per encoding in NETWORK_ENCODINGS.
+    Call the result with no argument for the plain payload, or with an encoding for the compressed one.
+    """
+    @cached_by_mtime(csv_path, maxsize=len(NETWORK_ENCODINGS) + 1)
+    def payload(encoding=None):
+        if encoding is None:
+            return to_json_bytes(build())
+        return compress_payload(payload(), encoding)
+    return payload
+
+
+citation_network_json = cached_network_json(REFS_CSV_PATH, _citation_network)
+collaboration_network_json = cached_network_json(AFFILS_CSV_PATH, _collaboration_network)
+enhanced_citation_network_json = cached_network_json(REFS_CSV_PATH, _enhanced_citation_network)
+
+
+def network_response(csv_path, build_json, errors):
+    """
+    Serves a cached network payload, pre-compressed when the client accepts br/gzip
+    (flask-compress leaves responses that already have a Content-Encoding alone).
+    Error payloads are serialized per request and never cached.
+    """
+    encoding = request.accept_encodings.best_match(NETWORK_ENCODINGS)
+    body = network_or_error(csv_path, lambda: build_json(encoding), errors)
+    if not isinstance(body, bytes):
+        return Response(to_json_bytes(body), mimetype="application/json")
+    
+    response = Response(body, mimetype="application/json")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
 # --------------------------
 # API Routing
 # --------------------------
 @app.route("/api/citation-network", methods=["GET"])
 def get_citation_network():
-    data = generate_citation_network()
-    return jsonify(data)
+    return network_response(REFS_CSV_PATH, citation_network_json, CITATION_NETWORK_ERRORS)
 
 @app.route("/api/collaboration-network", methods=["GET"])
 def get_collaboration_network():
-    return jsonify(generate_collaboration_network())
+    return network_response(AFFILS_CSV_PATH, collaboration_network_json, COLLABORATION_NETWORK_ERRORS)
+
+
+# Sample data for the paper-count and patent-citation charts: generated once at import and served pre-serialized
+PAPER_COUNTS_JSON = to_json_bytes([{"year": year, "count": int(np.random.randint(5, 35))} for year in range(2014, 2024)])
+PATENT_CITATIONS_JSON = to_json_bytes([{"patentCount": i, "paperCount": int(np.random.randint(5, 55))} for i in range(15)])
 
 
 @app.route("/api/paper-counts", methods=["GET"])
 def get_paper_counts():
-    try:
-      
-        years = range(2014, 2024)  
-        data = [{"year": year, "count": np.random.randint(5, 35)} for year in years]
-        return jsonify(convert_numpy_types(data))
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return Response(PAPER_COUNTS_JSON, mimetype="application/json")
 
 
 @app.route("/api/patent-citations", methods=["GET"])
 def get_patent_citations():
-    try:
-      
-        data = [{"patentCount": i, "paperCount": np.random.randint(5, 55)} for i in range(15)]
-        return jsonify(convert_numpy_types(data))
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return Response(PATENT_CITATIONS_JSON, mimetype="application/json")
         
 @app.route("/api/enhanced-citation-network", methods=["GET"])
 def get_enhanced_citation_network():
-    data = generate_enhanced_citation_network()
-    return jsonify(data)
+    return network_response(REFS_CSV_PATH, enhanced_citation_network_json, CITATION_NETWORK_ERRORS)
 
 # --------------------------
 # Server On